@@ -3,6 +3,7 @@ import sys
 import threading
 import time
 
+import numpy as np
 from sage.base_app import BaseApp
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +23,12 @@ class Core(BaseApp):
         # Initialize start_time to None. It will be set on the first run_in_loop call.
         self.start_time = None  
 
+        # Retrieve datarates and calculate samples per imu tick and their spacing.
+        emg_datarate = self.info["emg_datarate"]
+        imu_datarate = self.info["imu_datarate"]
+        self._n_samples = int(emg_datarate / imu_datarate) if imu_datarate else 1
+        self._sample_dt = (1 / imu_datarate) / self._n_samples if imu_datarate else 0.0
+
         try:
             self.emg_reader = EMGReader(
                 low_cut=self.config.get("low_cut"),
@@ -62,37 +69,31 @@ class Core(BaseApp):
 
         # Get EMG data from reader
         signals = self.emg_reader.last_emg
-        raw_emg_full = signals["raw"]
-        bandpassed_emg_full = signals["bandpass"]
-        notched_emg_full = signals["notch"]
-        rms_envelope_emg_full = signals["envelope"]
 
-        # Retrieve datarates and calculate samples per imu tick
-        emg_datarate = self.info["emg_datarate"]
-        imu_datarate = self.info["imu_datarate"]
-        n_samples = int(emg_datarate / imu_datarate) if imu_datarate else 1
-
-        # Helper function to get the last n samples from a list.
-        def get_last_samples(lst):
-            return lst[-n_samples:] if len(lst) >= n_samples else lst
-
-        raw_emg_samples = get_last_samples(raw_emg_full)
-        bandpassed_emg_samples = get_last_samples(bandpassed_emg_full)
-        notched_emg_samples = get_last_samples(notched_emg_full)
-        rms_envelope_emg_samples = get_last_samples(rms_envelope_emg_full)
+        # The signals are array views, so slicing the last n samples is a view as
+        # well; only the short tail is copied when converted to a list.
+        n_samples = self._n_samples
+        raw_emg_samples = signals["raw"][-n_samples:].tolist()
+        bandpassed_emg_samples = signals["bandpass"][-n_samples:].tolist()
+        notched_emg_samples = signals["notch"][-n_samples:].tolist()
+        rms_envelope_emg_samples = signals["envelope"][-n_samples:].tolist()
 
         num_samples = len(raw_emg_samples)
 
+        # Distribute sample times evenly over the IMU tick interval.
+        sample_times = (time_now + np.arange(num_samples) * self._sample_dt).tolist()
+
         # Save data at EMG datarate by sending all samples
-        for idx in range(num_samples):
-            # Distribute sample times evenly over the IMU tick interval.
-            sample_time = time_now + (idx * (1 / imu_datarate) / n_samples)
+        for sample_time, raw, bandpassed, notched, envelope in zip(
+                sample_times, raw_emg_samples, bandpassed_emg_samples,
+                notched_emg_samples, rms_envelope_emg_samples):
+            # save_data may keep the dict it is given, so each sample gets its own.
             my_data = {
                 "Time(s)": [sample_time],
-                "Raw_EMG(mV)": [raw_emg_samples[idx]],
-                "Bandpass_Filter(mV)": [bandpassed_emg_samples[idx]],
-                "Notch_Filter(mV)": [notched_emg_samples[idx]],
-                "RMS_Envelope(mV)": [rms_envelope_emg_samples[idx]]
+                "Raw_EMG(mV)": [raw],
+                "Bandpass_Filter(mV)": [bandpassed],
+                "Notch_Filter(mV)": [notched],
+                "RMS_Envelope(mV)": [envelope]
             }
             try:
                 self.my_sage.save_data(data, my_data)
@@ -101,9 +102,8 @@ class Core(BaseApp):
 
         # Send stream data at IMU datarate using only the latest sample
         if num_samples:
-            sample_time = time_now + ((num_samples - 1) * (1 / imu_datarate) / n_samples)
             my_data = {
-                "Time(s)": [sample_time],
+                "Time(s)": [sample_times[-1]],
                 "Raw_EMG(mV)": [raw_emg_samples[-1]],
                 "Bandpass_Filter(mV)": [bandpassed_emg_samples[-1]],
                 "Notch_Filter(mV)": [notched_emg_samples[-1]],
@@ -8,10 +8,17 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 import numpy as np
-import time
 import threading
-from collections import deque
-from scipy.signal import butter, filtfilt, iirnotch
+import weakref
+from functools import lru_cache
+from scipy.ndimage import uniform_filter1d
+from scipy.signal import butter, iirnotch, sosfilt, sosfilt_zi, tf2sos
+
+try:
+    from numba import njit
+except ImportError:
+    # Optional JIT; the filters fall back to scipy.signal.sosfilt without it.
+    njit = None
 
 from emg_sensor import iFocus
 
@@ -27,8 +34,89 @@ FILTER_ORDER = 4                 # Filter order for Butterworth filter
 QUALITY_FACTOR = 30.0            # Quality factor for notch filter
 DEFAULT_WINDOW_DURATION = 0.2    # Duration in seconds used to compute the window size
 
+@lru_cache(maxsize=32)
+def _bandpass_sos(fs, lowcut, highcut, order=FILTER_ORDER):
+    """Design the Butterworth bandpass filter with Nyquist normalized to one."""
+    low_norm = 2 * lowcut / fs
+    high_norm = 2 * highcut / fs
+    return butter(order, [low_norm, high_norm], btype='band', output='sos')
+
+@lru_cache(maxsize=32)
+def _notch_sos(fs, notch_freq, quality_factor=QUALITY_FACTOR):
+    """Design the power line notch filter with Nyquist normalized to one."""
+    freq_norm = 2 * notch_freq / fs
+    return tf2sos(*iirnotch(freq_norm, quality_factor))
+
+@lru_cache(maxsize=32)
+def _specialized_sosfilt(coefficients):
+    """Compile a streaming SOS filter with the given flattened coefficients baked in."""
+    if njit is None:
+        return None
+    n_sections = len(coefficients) // 6
+
+    # The coefficients are a closure constant, so numba folds them into the compiled
+    # biquads. The signature is given to compile now rather than on the first packet.
+    @njit("float32[:](float32[:], float64[:, :])", fastmath=True)
+    def sosfilt_specialized(x, zi):
+        y = np.empty_like(x)
+        for i in range(x.size):
+            value = x[i]
+            for s in range(n_sections):
+                b0, b1, b2 = coefficients[6 * s], coefficients[6 * s + 1], coefficients[6 * s + 2]
+                a1, a2 = coefficients[6 * s + 4], coefficients[6 * s + 5]
+                out = b0 * value + zi[s, 0]
+                zi[s, 0] = b1 * value - a1 * out + zi[s, 1]
+                zi[s, 1] = b2 * value - a2 * out
+                value = out
+            y[i] = value
+        return y
+
+    return sosfilt_specialized
+
+class SampleWindow:
+    # Holds the most recent samples in a mirrored NumPy ring buffer. Every sample is
+    # written to both halves, so the window is always one contiguous, zero-copy slice.
+    def __init__(self, size, dtype=np.float32):
+        self.size = size
+        self._buf = np.zeros(2 * size, dtype=dtype)
+        self._head = 0
+        self._filled = 0
+
+    def __len__(self):
+        return self._filled
+
+    def clear(self):
+        """Drop all buffered samples."""
+        self._head = 0
+        self._filled = 0
+
+    def extend(self, values):
+        """Overwrite the oldest samples with the new values."""
+        n = len(values)
+        if n >= self.size:
+            values = values[-self.size:]
+            n = self.size
+        end = self._head + n
+        if end <= self.size:
+            self._buf[self._head:end] = values
+            self._buf[self._head + self.size:end + self.size] = values
+        else:
+            split = self.size - self._head
+            self._buf[self._head:self.size] = values[:split]
+            self._buf[self._head + self.size:] = values[:split]
+            self._buf[:end - self.size] = values[split:]
+            self._buf[self.size:end] = values[split:]
+        self._head = end % self.size
+        self._filled = min(self._filled + n, self.size)
+
+    def view(self):
+        """Return the buffered samples in chronological order without copying."""
+        if self._filled < self.size:
+            return self._buf[:self._filled]
+        return self._buf[self._head:self._head + self.size]
+
 class EMGFilter:
-    # Applies filtering operations to raw EMG data.
+    # Applies streaming filtering operations to raw EMG data.
     def __init__(self, fs, window_size, low_cut=DEFAULT_LOW_CUT, high_cut=DEFAULT_HIGH_CUT, notch=DEFAULT_NOTCH):
         # Initialize filter parameters and outputs.
         self.fs = fs
@@ -37,47 +125,139 @@ class EMGFilter:
         self.highcut = high_cut
         self.notch_freq = notch
         self.quality_factor = QUALITY_FACTOR
-        
-        # Containers for storing data at different processing stages.
-        self.raw_data = []
-        self.bandpassed_data = []
-        self.notched_data = []
-        self.envelope_data = []
+
+        # Filter coefficients only depend on the parameters above, so design them once.
+        # Bandpass and notch form one SOS cascade sharing a single state array; it is
+        # split at the stage boundary because the bandpass output is saved as well.
+        bp_sos = _bandpass_sos(self.fs, self.lowcut, self.highcut, FILTER_ORDER)
+        self._sos = np.vstack([bp_sos, _notch_sos(self.fs, self.notch_freq, self.quality_factor)])
+        self._n_bp_sections = len(bp_sos)
+        self._bp_sos = self._sos[:self._n_bp_sections]
+        self._n_sos = self._sos[self._n_bp_sections:]
+        # Compiled per-stage filters when numba is available, updating the state in place.
+        self._bp_kernel = _specialized_sosfilt(tuple(self._bp_sos.ravel().tolist()))
+        self._n_kernel = _specialized_sosfilt(tuple(self._n_sos.ravel().tolist()))
+
+        # Containers for the last window of data at different processing stages.
+        # The raw window is kept by the reader, which needs it before the filter is seeded.
+        self._bandpassed = SampleWindow(window_size)
+        self._notched = SampleWindow(window_size)
+        self._envelope = SampleWindow(window_size)
+
+        # Scratch buffers reused by compute_rms_envelope, sized for a window plus new samples.
+        self._sq = np.empty(2 * window_size, dtype=np.float32)
+        self._env = np.empty(2 * window_size, dtype=np.float32)
+        self.reset()
+
+    @property
+    def bandpassed_data(self):
+        return self._bandpassed.view()
+
+    @property
+    def notched_data(self):
+        return self._notched.view()
+
+    @property
+    def envelope_data(self):
+        return self._envelope.view()
+
+    def reset(self):
+        """Clear filter state and outputs so the next sample starts a new stream."""
+        self._zi = None
+        # Running sum of squares over the filtered window behind the RMS envelope.
+        self._sum_sq = 0.0
+        self._resync_countdown = 0
+        self._bandpassed.clear()
+        self._notched.clear()
+        self._envelope.clear()
+
+    def _cascade_state(self, first_sample):
+        """Return the cascade filter state, starting it on the first sample of a stream."""
+        if self._zi is None:
+            # Start from the steady state of the first sample to avoid a step transient.
+            # Coefficients and state stay float64: with a DC offset of a few hundred mV,
+            # float32 state rounding is on the order of the EMG itself.
+            self._zi = sosfilt_zi(self._sos) * first_sample
+        return self._zi
 
     def bandpass_filter(self, data):
-        """Apply bandpass filter to the data with Nyquist normalized to one."""
-        # Calculate normalized cutoff frequencies (Nyquist is 1)
-        low_norm = 2 * self.lowcut / self.fs
-        high_norm = 2 * self.highcut / self.fs
-        b, a = butter(FILTER_ORDER, [low_norm, high_norm], btype='band')
-        return filtfilt(b, a, data)
+        """Apply bandpass filter to new samples, carrying the filter state across calls."""
+        zi = self._cascade_state(data[0])
+        if self._bp_kernel is not None:
+            return self._bp_kernel(np.asarray(data, dtype=np.float32), zi[:self._n_bp_sections])
+        filtered, zi[:self._n_bp_sections] = sosfilt(self._bp_sos, data, zi=zi[:self._n_bp_sections])
+        return filtered
 
     def notch_filter(self, data):
-        """Apply notch filter to remove power line noise with normalized frequency."""
-        # Calculate normalized notch frequency (Nyquist is 1)
-        freq_norm = 2 * self.notch_freq / self.fs
-        b, a = iirnotch(freq_norm, self.quality_factor)
-        return filtfilt(b, a, data)
+        """Apply notch filter to new samples to remove power line noise."""
+        zi = self._cascade_state(data[0])
+        if self._n_kernel is not None:
+            return self._n_kernel(np.asarray(data, dtype=np.float32), zi[self._n_bp_sections:])
+        filtered, zi[self._n_bp_sections:] = sosfilt(self._n_sos, data, zi=zi[self._n_bp_sections:])
+        return filtered
 
     def compute_rms_envelope(self, data):
-        """Compute RMS envelope of the signal."""
-        rect = np.abs(data)
-        return np.sqrt(np.convolve(rect**2, 
-                                 np.ones(self.window_size)/self.window_size, 
-                                 mode='same'))
-
-    def process_data(self, raw_data):
-        """Process the EMG data through filtering stages."""
-        self.raw_data = raw_data
-        
+        """Compute RMS envelope of the signal over a trailing moving window.
+
+        The result is written to a scratch buffer that the next call overwrites.
+        """
+        n = len(data)
+        if n > self._sq.size:
+            self._sq = np.empty(n, dtype=np.float32)
+            self._env = np.empty(n, dtype=np.float32)
+        sq = np.square(data, out=self._sq[:n])
+        # Shift the averaging window so each value only covers past samples,
+        # keeping the newest envelope values free of edge padding.
+        mean_square = uniform_filter1d(sq, self.window_size, output=self._env[:n], mode='nearest',
+                                       origin=(self.window_size - 1) // 2)
+        return np.sqrt(mean_square, out=mean_square)
+
+    def _update_rms_envelope(self, notched):
+        """Compute the RMS envelope values for newly filtered samples before they enter the window."""
+        window = self.notched_data
+        n = len(notched)
+        if len(window) < self.window_size or n >= self.window_size or self._resync_countdown <= 0:
+            # Not enough history for the running sum (or time to drop accumulated rounding):
+            # compute the tail directly and seed the sum from the window it ends with.
+            history = np.concatenate((window, notched))
+            tail = history[-self.window_size:].astype(np.float64)
+            self._sum_sq = float(np.dot(tail, tail))
+            self._resync_countdown = self.window_size
+            return self.compute_rms_envelope(history)[-n:]
+        # Slide the window one sample at a time: add each new square, drop the oldest.
+        running = np.square(notched, dtype=np.float64)
+        running -= np.square(window[:n], dtype=np.float64)
+        np.cumsum(running, out=running)
+        running += self._sum_sq
+        self._sum_sq = float(running[-1])
+        self._resync_countdown -= n
+        np.maximum(running, 0.0, out=running)
+        running /= self.window_size
+        return np.sqrt(running, out=running)
+
+    def process_new(self, new_samples):
+        """Push new EMG samples through the filtering stages."""
+        new_samples = np.asarray(new_samples, dtype=np.float32)
+
         # Apply bandpass filtering.
-        self.bandpassed_data = self.bandpass_filter(raw_data)
-        
+        bandpassed = self.bandpass_filter(new_samples)
+        self._bandpassed.extend(bandpassed)
+
         # Remove power line noise using notch filtering.
-        self.notched_data = self.notch_filter(self.bandpassed_data)
-        
-        # Compute the RMS envelope of the filtered signal.
-        self.envelope_data = self.compute_rms_envelope(self.notched_data)
+        notched = self.notch_filter(bandpassed)
+
+        # Compute the RMS envelope for the new samples over the filtered window.
+        self._envelope.extend(self._update_rms_envelope(notched))
+        self._notched.extend(notched)
+
+def _release_device(device):
+    # Stop acquisition and close the device connection. Registered with weakref.finalize,
+    # so it runs once: from stop_reading, when the reader is collected, or at exit.
+    try:
+        device.stop_acquisition()
+        device.close_dev()
+    except Exception as e:
+        print(f"Error releasing EMG device: {e}")
 
 class EMGReader:
     def __init__(self, low_cut=DEFAULT_LOW_CUT, high_cut=DEFAULT_HIGH_CUT, notch=DEFAULT_NOTCH, sample_rate_variant="high"):
@@ -93,6 +273,7 @@ class EMGReader:
         # Connect to the first available device.
         self.device = iFocus()
         self.device_port = self.device.dev_args['name']
+        self._finalizer = weakref.finalize(self, _release_device, self.device)
         
         self.fs = self.device.dev_args['fs_eeg']
         self.lowcut = low_cut
@@ -101,7 +282,10 @@ class EMGReader:
         # Compute window size using the DEFAULT_WINDOW_DURATION constant.
         self.window_size = int(self.fs * DEFAULT_WINDOW_DURATION)
         self.filter = EMGFilter(self.fs, self.window_size, low_cut, high_cut, notch)
-        self.recent_points = deque(maxlen=self.window_size)
+        # Preallocated ring buffer holding the most recent window of raw samples.
+        self._raw = SampleWindow(self.window_size)
+        # Set once the first full window has seeded the filter.
+        self._warm = False
         
         self.samples_per_packet = 5
         self.running = False
@@ -120,52 +304,57 @@ class EMGReader:
     def _read_loop(self):
         # Continuously fetch and process data frames from the device.
         while self.running:
+            # get_data blocks for up to the timeout while no data is buffered.
             frames = self.device.get_data(timeout=0.1)
             if not frames:
-                time.sleep(0.01)
                 continue
             for frame in frames:
                 if not frame:
                     continue
                 # Extract EMG channel values from the frame.
-                emg_values = [sample[0] for sample in frame[:self.samples_per_packet]]
-                for val in emg_values:
-                    self.recent_points.append(val)
-                    # Process data only when sufficient samples have been collected.
-                    if len(self.recent_points) >= self.window_size:
-                        self._process_emg_data()
+                emg_values = np.fromiter(
+                    (sample[0] for sample in frame[:self.samples_per_packet]),
+                    dtype=np.float32,
+                    count=self.samples_per_packet,
+                )
+                self._raw.extend(emg_values)
+                # Process data only when sufficient samples have been collected.
+                if self._warm or len(self._raw) == self.window_size:
+                    self._process_emg_data(emg_values)
         print("EMG reading thread exiting")
         
     def stop_reading(self):
         # Stop acquisition, clean up thread resources, and close device connection.
-        if not self.running:
+        if not self._finalizer.alive:
             return
         self.running = False
         if self.read_thread and self.read_thread.is_alive():
             self.read_thread.join(timeout=2.0)
-        self.device.stop_acquisition()
-        self.device.close_dev()
-        self.recent_points.clear()
+        self._finalizer()
+        self._raw.clear()
+        self.filter.reset()
+        self._warm = False
         print("EMG reader stopped")
         
-    def _process_emg_data(self):
-        # Process the collected data if it meets the window size requirement.
-        if len(self.recent_points) < self.window_size:
-            return
-        
-        arr = np.array(list(self.recent_points))
-        self.filter.process_data(arr)
+    def _process_emg_data(self, new_samples):
+        # Process a packet once the window size requirement has been met.
+        if self._warm:
+            # Only the new samples need filtering; the filter carries its state forward.
+            self.filter.process_new(new_samples)
+        else:
+            # First full window: seed the filter state and outputs with the whole window.
+            self.filter.process_new(self._raw.view())
+            self._warm = True
 
     @property
     def last_raw_emg(self):
         # Provide access to the last raw EMG samples.
-        return list(self.recent_points)
+        return self._raw.view()
     
     @property
     def last_filtered_emg(self):
         # Provide access to the final filtered (RMS envelope) data.
-        data = self.filter.envelope_data
-        return data.tolist() if hasattr(data, "tolist") else data
+        return self.filter.envelope_data
     
     @property
     def last_rms_envelope_emg(self):
@@ -175,26 +364,19 @@ class EMGReader:
     @property
     def last_bandpassed_emg(self):
         # Provide access to the bandpass filtered data.
-        data = self.filter.bandpassed_data
-        return data.tolist() if hasattr(data, "tolist") else data
+        return self.filter.bandpassed_data
 
     @property
     def last_notched_emg(self):
         # Provide access to the notch filtered data.
-        data = self.filter.notched_data
-        return data.tolist() if hasattr(data, "tolist") else data
+        return self.filter.notched_data
 
     @property
     def last_emg(self):
-        # Combine all processed EMG outputs in a single dictionary.
+        # Combine all processed EMG outputs in a single dictionary of array views.
         return {
-            "raw": list(self.recent_points),
+            "raw": self.last_raw_emg,
             "bandpass": self.last_bandpassed_emg,
             "notch": self.last_notched_emg,
             "envelope": self.last_filtered_emg
         }
-
-    def __del__(self):
-        # Ensure resources are released when the object is destroyed.
-        self.stop_reading()
-
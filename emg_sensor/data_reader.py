@@ -1,10 +1,7 @@
-import time
-import queue
-from queue import Queue
-from threading import Thread
+from collections import deque
+from threading import Condition, Event, Thread
 from typing import Optional
 from enum import Enum
-from copy import deepcopy
 
 from .iFocusParser import Parser
 from .emg_sock import sock
@@ -27,6 +24,8 @@ class iFocus(Thread):
         "channel_imu": {0: "X", 1: "Y", 2: "Z"},
         "AdapterInfo": "Serial Port",
     }
+    # Frames to wait for per serial read, about 40 ms of data at 500 Hz.
+    _frames_per_read = 4
 
     def __init__(self, port: Optional[str] = None) -> None:
         """
@@ -34,12 +33,18 @@ class iFocus(Thread):
             port: if not given, connect to the first available device.
         """
         super().__init__(daemon=True)
+        # Notified on every status change so callers block instead of polling.
+        self.__status_changed = Condition()
         self.__status = iFocus.Dev.TERMINATE
         if port is None:
             port = iFocus.find_devs()[0]
-        self.__save_data = Queue()
+        # Single producer (this thread) and single consumer, deque append/popleft
+        # are atomic. The event only takes its lock when the consumer has drained
+        # everything and may be waiting for the next chunk.
+        self.__save_data = deque()
+        self.__data_ready = Event()
         self.__parser = Parser()
-        self.dev_args = deepcopy(iFocus.dev_args)
+        self.dev_args = iFocus._copy_args(iFocus.dev_args)
         self.dev = sock(port)
         self.set_frequency()
         self.__with_q = True
@@ -53,7 +58,7 @@ class iFocus(Thread):
                 self.dev.close_socket()
             finally:
                 raise e
-        self.__status = iFocus.Dev.IDLE_START
+        self.__set_status(iFocus.Dev.IDLE_START)
         self.__socket_flag = None
         self._bdf_file = None
         self.__enable_imu = False
@@ -88,7 +93,12 @@ class iFocus(Thread):
         """
         Get current device information, including device name, hardware channel number, acquired channels, sample frequency, etc.
         """
-        return deepcopy(self.dev_args)
+        return iFocus._copy_args(self.dev_args)
+
+    @staticmethod
+    def _copy_args(args: dict) -> dict:
+        # dev_args only nests flat channel dicts, a one-level copy is enough.
+        return {k: (v.copy() if isinstance(v, dict) else v) for k, v in args.items()}
 
     @staticmethod
     def find_devs() -> list:
@@ -116,12 +126,12 @@ class iFocus(Thread):
         self.__check_dev_status()
         if not self.__with_q:
             return
-        try:
-            data: list = self.__save_data.get(timeout=timeout)
-        except queue.Empty:
+        if not self.__save_data and not self.__data_ready.wait(timeout):
             return []
-        while not self.__save_data.empty():
-            data.extend(self.__save_data.get())
+        self.__data_ready.clear()
+        data = []
+        while self.__save_data:
+            data.extend(self.__save_data.popleft())
         return data
 
     def start_acquisition_data(self, with_q: bool = True) -> None:
@@ -132,9 +142,8 @@ class iFocus(Thread):
         self.__with_q = with_q
         if self.__status == iFocus.Dev.SIGNAL:
             return
-        self.__status = iFocus.Dev.SIGNAL_START
-        while self.__status not in [iFocus.Dev.SIGNAL, iFocus.Dev.TERMINATE]:
-            time.sleep(0.01)
+        self.__set_status(iFocus.Dev.SIGNAL_START)
+        self.__wait_status(iFocus.Dev.SIGNAL, iFocus.Dev.TERMINATE)
         self.__check_dev_status()
 
     def stop_acquisition(self) -> None:
@@ -142,9 +151,8 @@ class iFocus(Thread):
         Stop data or impedance acquisition, block until data acquisition stopped or failed.
         """
         self.__check_dev_status()
-        self.__status = iFocus.Dev.IDLE_START
-        while self.__status not in [iFocus.Dev.IDLE, iFocus.Dev.TERMINATE]:
-            time.sleep(0.01)
+        self.__set_status(iFocus.Dev.IDLE_START)
+        self.__wait_status(iFocus.Dev.IDLE, iFocus.Dev.TERMINATE)
         self.__check_dev_status()
 
     def setIMUFlag(self, check):
@@ -156,53 +164,52 @@ class iFocus(Thread):
         """
         if self.__status != iFocus.Dev.TERMINATE:
             # ensure socket is closed correctly
-            self.__status = iFocus.Dev.TERMINATE_START
-            while self.__status != iFocus.Dev.TERMINATE:
-                time.sleep(0.1)
+            self.__set_status(iFocus.Dev.TERMINATE_START)
+            self.__wait_status(iFocus.Dev.TERMINATE)
         if self.is_alive():
             self.join()
 
     def __recv_data(self):
         try:
             self.dev.start_data()
-            self.__status = iFocus.Dev.SIGNAL
+            self.__set_status(iFocus.Dev.SIGNAL)
         except Exception as e:
             print(f"Start data error: {e}")
             self.__socket_flag = f"SIGNAL mode initialization failed: {str(e)}"
-            self.__status = iFocus.Dev.TERMINATE_START
+            self.__set_status(iFocus.Dev.TERMINATE_START)
             return
 
         while self.__status in [iFocus.Dev.SIGNAL]:
             try:
-                data = self.dev.recv_socket(100)  # Increased buffer size
+                # Read all pending bytes, but wait for a few whole frames per call
+                data = self.dev.recv_socket(
+                    min_size=self.__parser._threshold * iFocus._frames_per_read
+                )
                 if not data:
-                    time.sleep(0.01)  # Short sleep to prevent busy waiting
-                    continue  # Don't raise exception, just try again
+                    continue  # Serial read timed out, don't raise exception, just try again
                 
                 ret = self.__parser.parse_data(data)
                 if ret:
                     if self.__with_q:
-                        self.__save_data.put(ret)
+                        self.__save_data.append(ret)
+                        # get_data clears the event before draining, so a still-set
+                        # event means this chunk will be picked up without a wake-up.
+                        if not self.__data_ready.is_set():
+                            self.__data_ready.set()
                     # Only process BDF if flag is enabled
                     if self.__bdf_flag and self._bdf_file:
                         self._bdf_file.write_chunk(ret)
             except Exception as e:
                 print(f"Data receive error: {e}")
                 self.__socket_flag = f"Data transmission error: {str(e)}"
-                self.__status = iFocus.Dev.TERMINATE_START
+                self.__set_status(iFocus.Dev.TERMINATE_START)
                 break
 
         # clear buffer
         self.__parser.clear_buffer()
-        # Signal end of data stream
-        self.__save_data.put(None)
-        
-        # Clean up queue
-        try:
-            while not self.__save_data.empty():
-                self.__save_data.get_nowait()
-        except:
-            pass
+        # Clean up queue and wake a waiting consumer at the end of the data stream
+        self.__save_data.clear()
+        self.__data_ready.set()
         
         # stop recv data
         if self.__status != iFocus.Dev.TERMINATE_START:
@@ -212,23 +219,34 @@ class iFocus(Thread):
                 print(f"Stop receive error: {e}")
                 if self.__status == iFocus.Dev.IDLE_START:
                     self.__socket_flag = "Connection lost."
-                self.__status = iFocus.Dev.TERMINATE_START
+                self.__set_status(iFocus.Dev.TERMINATE_START)
 
     def run(self):
         while self.__status != iFocus.Dev.TERMINATE_START:
             if self.__status == iFocus.Dev.SIGNAL_START:
                 self.__recv_data()
             elif self.__status == iFocus.Dev.IDLE_START:
-                self.__status = iFocus.Dev.IDLE
-                while self.__status == iFocus.Dev.IDLE:
-                    time.sleep(0.1)
+                self.__set_status(iFocus.Dev.IDLE)
+                with self.__status_changed:
+                    self.__status_changed.wait_for(
+                        lambda: self.__status != iFocus.Dev.IDLE
+                    )
             else:
                 self.__socket_flag = f"Unknown status: {self.__status.name}"
                 break
         try:
             self.dev.close_socket()
         finally:
-            self.__status = iFocus.Dev.TERMINATE
+            self.__set_status(iFocus.Dev.TERMINATE)
+
+    def __set_status(self, status: "iFocus.Dev"):
+        with self.__status_changed:
+            self.__status = status
+            self.__status_changed.notify_all()
+
+    def __wait_status(self, *statuses: "iFocus.Dev"):
+        with self.__status_changed:
+            self.__status_changed.wait_for(lambda: self.__status in statuses)
 
     def __check_dev_status(self):
         if self.__socket_flag is None:
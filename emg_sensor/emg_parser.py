@@ -1,20 +1,31 @@
+import numpy as np
+
+# Conversion factor as in EMGReader
+EMG_RATIO = 0.0240405
+
+
+def decode_int24(data) -> np.ndarray:
+    """
+    Decodes little-endian signed 24-bit integers in one vectorized pass.
+    Accepts raw bytes or a uint8 array whose length is a multiple of 3 and
+    returns an int32 array with one value per 3-byte sample.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    raw = raw.reshape(-1, 3)
+    padded = np.zeros((raw.shape[0], 4), dtype=np.uint8)
+    padded[:, :3] = raw
+    values = padded.view("<i4").reshape(-1)
+    # Move bit 23 into the sign bit and shift back to sign-extend to 32 bits.
+    return (values << 8) >> 8
+
+
 def parse_packet(packet: bytes) -> dict:
     """
     Expects a packet containing 15 bytes of EMG data (5 channels, 3 bytes each)
-    followed by IMU data. Returns a dict with keys 'emg' and 'imu'.
+    followed by IMU data. Returns a dict with keys 'emg' (list of floats) and 'imu'.
     """
     if len(packet) < 15:
         raise ValueError("Incomplete packet: less than 15 bytes")
-    emg_bytes = packet[:15]
-    emg_values = []
-    import struct
-    for i in range(5):
-        start = i * 3
-        val = int.from_bytes(emg_bytes[start:start+3], byteorder="little", signed=False)
-        if val & 0x00800000:  # sign extension if needed
-            val |= 0xFF000000
-            val = struct.unpack("<i", val.to_bytes(4, "little"))[0]
-        # Conversion factor as in EMGReader
-        emg_values.append(val * 0.0240405)
+    emg_values = (decode_int24(packet[:15]) * EMG_RATIO).tolist()
     imu_data = packet[15:]  # ignore IMU processing; optionally validate length
     return {"emg": emg_values, "imu": imu_data}
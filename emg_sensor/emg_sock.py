@@ -1,3 +1,10 @@
+import time
+from functools import lru_cache
+
+# Seconds a discovered device list is reused before the ports are probed again.
+_FIND_DEVS_TTL = 5.0
+
+
 class sock:
     fs = {
         250: b"\x04",
@@ -25,6 +32,12 @@ class sock:
 
     @staticmethod
     def _find_devs() -> list:
+        # Probing opens every FTDI port, so repeated lookups share one result per TTL window.
+        return list(sock._probe_devs(int(time.monotonic() // _FIND_DEVS_TTL)))
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _probe_devs(_ttl_window: int) -> tuple:
         from serial.tools.list_ports import comports
         from serial import Serial, serialutil
         ret = []
@@ -46,7 +59,7 @@ class sock:
         if len(ret) == 0:
             print("No compatible devices found")
             raise Exception("EMG device not found")
-        return ret
+        return tuple(ret)
 
     def connect_socket(self):
         self.start_data()
@@ -58,8 +71,9 @@ class sock:
             self.time.sleep(0.1)
         raise Exception("connection failed, no data available.")
 
-    def recv_socket(self, buffer_size: int = 30):
-        return self.dev.read(buffer_size)
+    def recv_socket(self, buffer_size: int = 4096, min_size: int = 1):
+        # Drain whatever the driver has buffered in one read, waiting for at least min_size bytes.
+        return self.dev.read(min(max(min_size, self.dev.in_waiting), buffer_size))
 
     def start_data(self):
         self.dev.read_all()
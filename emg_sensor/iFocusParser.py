@@ -1,6 +1,10 @@
 import re
 from datetime import datetime
 
+import numpy as np
+
+from .emg_parser import decode_int24
+
 
 class Parser:
     _byts = 3
@@ -42,62 +46,56 @@ class Parser:
         self.__buffer.extend(q)
         if len(self.__buffer) < self._threshold:
             return
-        frames = []
-        for frame_obj in self.__pattern.finditer(self.__buffer):
-            frame = memoryview(frame_obj.group())
-            if (
-                frame[self.eeg_checksum]
-                != sum(frame[self._header : self.eeg_checksum]) & 0xFF
-            ):
-                err = f"|EEG Checksum invalid, packet dropped{datetime.now()}\n|Current:{frame.hex()}"
-                print(err)
-                continue
-            if (
-                frame[self.imu_checksum]
-                != sum(frame[self.imu_start : self.imu_checksum]) & 0xFF
-            ):
-                err = f"|IMU Checksum invalid, packet dropped{datetime.now()}\n|Current:{frame.hex()}"
-               
-                continue
-            cur_num = frame[self.eeg_seq]
-            if cur_num != ((self.eeg_last + 1) % 256):
-                self.__drop_eeg += 1
-                err = f">>>> EEG Pkt Los Cur:{cur_num} Last valid:{self.eeg_last} buf len:{len(self.__buffer)} dropped: {self.__drop_eeg} times {datetime.now()}<<<<\n"
-                print(err)
-            self.eeg_last = cur_num
-            cur_num = frame[self.imu_seq]
-            if cur_num != ((self.imu_last + 1) % 256):
-                self.__drop_imu += 1
-                err = f">>>> IMU Pkt Los Cur:{cur_num} Last valid:{self.imu_last} buf len:{len(self.__buffer)} dropped: {self.__drop_imu} times {datetime.now()}<<<<\n"
-        
-            self.imu_last = cur_num
+        matches = list(self.__pattern.finditer(self.__buffer))
+        if not matches:
+            return
+        # Matched frames all have the same length, so decode them as one array.
+        frames = np.frombuffer(
+            b"".join(frame_obj.group() for frame_obj in matches), dtype=np.uint8
+        ).reshape(-1, self._threshold)
+        del self.__buffer[: matches[-1].end()]
+        eeg_valid = frames[:, self.eeg_checksum] == (
+            frames[:, self._header : self.eeg_checksum].sum(axis=1) & 0xFF
+        )
+        for i in np.flatnonzero(~eeg_valid):
+            err = f"|EEG Checksum invalid, packet dropped{datetime.now()}\n|Current:{frames[i].tobytes().hex()}"
+            print(err)
+        imu_valid = frames[:, self.imu_checksum] == (
+            frames[:, self.imu_start : self.imu_checksum].sum(axis=1) & 0xFF
+        )
+        frames = frames[eeg_valid & imu_valid]
+        if not len(frames):
+            return
 
-            eeg = [
-                [
-                    int.from_bytes(
-                        frame[i : i + self._byts],
-                        signed=True,
-                        byteorder="little",
-                    )
-                    * self._ratio
-                ]
-                for i in self.eeg_idx
-            ]
-            imu = [
-                int.from_bytes(
-                    frame[i : i + self._imu_bytes],
-                    signed=True,
-                    byteorder="little",
-                )
-                * self._imu_ratio
-                for i in self.imu_idx
-            ]
-            eeg.append(imu)
-            frames.append(eeg)
-        if frames:
-            del self.__buffer[: frame_obj.end()]
-            return frames
+        eeg_seq = frames[:, self.eeg_seq].astype(np.int32)
+        expected = (np.concatenate(([self.eeg_last], eeg_seq[:-1])) + 1) % 256
+        for i in np.flatnonzero(eeg_seq != expected):
+            self.__drop_eeg += 1
+            last = self.eeg_last if i == 0 else eeg_seq[i - 1]
+            err = f">>>> EEG Pkt Los Cur:{eeg_seq[i]} Last valid:{last} buf len:{len(self.__buffer)} dropped: {self.__drop_eeg} times {datetime.now()}<<<<\n"
+            print(err)
+        self.eeg_last = int(eeg_seq[-1])
+        imu_seq = frames[:, self.imu_seq].astype(np.int32)
+        expected = (np.concatenate(([self.imu_last], imu_seq[:-1])) + 1) % 256
+        self.__drop_imu += int(np.count_nonzero(imu_seq != expected))
+        self.imu_last = int(imu_seq[-1])
 
+        eeg = (
+            decode_int24(frames[:, self._header : self.eeg_fall])
+            .astype(np.float32)
+            .reshape(-1, 5)
+            * np.float32(self._ratio)
+        )
+        imu = (
+            np.ascontiguousarray(frames[:, self.imu_start : self.imu_checksum])
+            .view("<i2")
+            .reshape(-1, 3)
+            * self._imu_ratio
+        )
+        return [
+            [[value] for value in eeg_row] + [imu_row]
+            for eeg_row, imu_row in zip(eeg.tolist(), imu.tolist())
+        ]
 
 if __name__ == "__main__":
     parser = Parser()